@@ -1,14 +1,61 @@
-from flask import Flask, jsonify, request, session, send_from_directory, send_file
+from flask import Flask, Response, g, has_app_context, jsonify, make_response, request, session
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import is_resource_modified
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.security import safe_join
+from werkzeug.wsgi import wrap_file
 from flask_cors import CORS
+from flask_caching import Cache
+from flask_compress import Compress
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 import sqlite3
-from datetime import datetime, date, timedelta
+import orjson
+import queue
+import atexit
+import threading
+import time
+from contextlib import contextmanager, suppress
+from datetime import datetime, date, timedelta, timezone
 import os
+import mimetypes
 import hashlib
+import hmac
 import secrets
-from functools import wraps
+from functools import lru_cache, wraps
+from urllib.parse import quote_plus
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson; unsupported types fall back to Flask's default"""
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, obj, **kwargs):
+        return self._dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Build the body as bytes directly, skipping the str round trip in dumps()
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps(obj) + b'\n', mimetype=self.mimetype)
+
+    def _dumps(self, obj):
+        option = self.option
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
 
 app = Flask(__name__, static_folder='.')
 app.secret_key = os.environ.get('SECRET_KEY', secrets.token_hex(32))
+app.json = ORJSONProvider(app)
+
+# Trust X-Forwarded-* from this many reverse proxies (Render, nginx) so remote_addr is the client
+PROXY_COUNT = int(os.environ.get('PROXY_COUNT', 0))
+if PROXY_COUNT:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=PROXY_COUNT, x_proto=PROXY_COUNT)
 
 # Configure CORS
 CORS(app, 
@@ -17,14 +64,98 @@ CORS(app,
         allow_headers=["Content-Type", "Authorization"],
         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"])
 
+# Cache leaderboard responses; use CACHE_TYPE=RedisCache with several workers
+cache = Cache(app, config={
+    'CACHE_TYPE': os.environ.get('CACHE_TYPE', 'SimpleCache'),
+    'CACHE_REDIS_URL': os.environ.get('REDIS_URL'),
+    'CACHE_DEFAULT_TIMEOUT': 60
+})
+
+# Compress text assets and API responses
+app.config.update(
+    COMPRESS_MIMETYPES=['text/html', 'text/css', 'text/javascript', 'application/javascript',
+                        'application/json', 'image/svg+xml'],
+    COMPRESS_ALGORITHM=['br', 'gzip']
+)
+Compress(app)
+
+# Per-IP rate limits; point RATELIMIT_STORAGE_URI at Redis to share counts between workers
+limiter = Limiter(get_remote_address, app=app, default_limits=[],
+                  storage_uri=os.environ.get('RATELIMIT_STORAGE_URI', 'memory://'))
+
+@app.errorhandler(429)
+def rate_limited(e):
+    return jsonify({'success': False, 'error': 'Too many attempts, try again later'}), 429
+
 DATABASE = 'leaderboard.db'
+DEFAULT_AVATAR_URL = 'https://ui-avatars.com/api/?name={}&background=ff642c&color=fff&size=200'
+STATIC_CHUNK_SIZE = 64 * 1024
+STATIC_MAX_AGE = 86400
+# index.html links style.css and script.js without a version, so these must revalidate every load
+REVALIDATE_EXTENSIONS = {'.html', '.css', '.js'}
+# Internal nginx location mapped onto the app directory (see nginx.conf)
+X_ACCEL_PREFIX = os.environ.get('X_ACCEL_PREFIX')
+# Front-end file types; everything else in the app directory (app.py, the database) stays private
+STATIC_EXTENSIONS = {'.html', '.css', '.js', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico',
+                     '.glb', '.woff', '.woff2'}
+POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))
+AUTH_CACHE_TTL = 60
+
+PH = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=1)
+
+# Long-lived connections shared across requests
+POOL = queue.LifoQueue(maxsize=POOL_SIZE)
+OPTIMIZE_INTERVAL = 3600
+last_optimize = time.monotonic()
+
+# Audit rows waiting for the background writer
+LOG_QUEUE = queue.Queue()
+LOG_BATCH_SIZE = 256
+log_writer = None
 
 # ========== STATIC FILE SERVING ==========
 
+def send_static(path):
+    """Hand a file to the server's wsgi.file_wrapper (sendfile where supported)"""
+    if not path or not os.path.isfile(path):
+        return "File not found", 404
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in STATIC_EXTENSIONS:
+        return "File not found", 404
+    
+    # A new deploy shows up on the next load; unchanged files still come back as 304
+    max_age = 0 if extension in REVALIDATE_EXTENSIONS else STATIC_MAX_AGE
+    
+    mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    if X_ACCEL_PREFIX and not app.debug:
+        # Let nginx read the file and handle conditional requests itself
+        response = Response(mimetype=mimetype)
+        response.headers['X-Accel-Redirect'] = X_ACCEL_PREFIX + os.path.relpath(path).replace(os.sep, '/')
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        return response
+    
+    stat = os.stat(path)
+    etag = f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+    last_modified = datetime.fromtimestamp(stat.st_mtime, timezone.utc)
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = Response(status=304)
+    else:
+        data = wrap_file(request.environ, open(path, 'rb'), STATIC_CHUNK_SIZE)
+        response = Response(data, mimetype=mimetype, direct_passthrough=True)
+        response.content_length = stat.st_size
+    
+    # Weak, since compression changes the bytes but not the meaning
+    response.set_etag(etag, weak=True)
+    response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    return response
+
 @app.route('/')
 def index():
     """Serve the main index.html"""
-    return send_file('index.html')
+    return send_static('index.html')
 
 @app.route('/<path:filename>')
 def serve_static(filename):
@@ -33,24 +164,69 @@ def serve_static(filename):
     if filename.startswith('api/'):
         return "Not found", 404
     
-    if os.path.exists(filename):
-        return send_from_directory('.', filename)
-    return "File not found", 404
+    return send_static(safe_join('.', filename))
 
 @app.route('/assets/<path:filename>')
 def serve_assets(filename):
     """Serve assets folder"""
-    return send_from_directory('assets', filename)
+    return send_static(safe_join('assets', filename))
+
+@app.after_request
+def add_json_etag(response):
+    """Let clients revalidate JSON responses with If-None-Match"""
+    if request.method == 'GET' and response.status_code == 200 and response.is_json:
+        response.add_etag()
+        response.make_conditional(request)
+    return response
 
 # ========== AUTHENTICATION ==========
 
 def hash_password(password):
-    """Hash password with SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Hash password with Argon2id"""
+    return PH.hash(password)
+
+def verify_password(password_hash, password):
+    """Check a password against an Argon2 hash or a legacy SHA-256 hash"""
+    if password_hash.startswith('$argon2'):
+        try:
+            return PH.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    legacy_hash = hashlib.sha256(password.encode()).hexdigest()
+    return hmac.compare_digest(password_hash, legacy_hash)
+
+@lru_cache(maxsize=None)
+def dummy_password_hash():
+    """Hash checked for unknown usernames so they take as long as a wrong password"""
+    return PH.hash(secrets.token_hex(16))
+
+def needs_rehash(password_hash):
+    """Legacy SHA-256 hashes and outdated Argon2 parameters get upgraded on login"""
+    return not password_hash.startswith('$argon2') or PH.check_needs_rehash(password_hash)
+
+def auth_cache_key(username, password):
+    """Keyed digest of the credentials, so the cache never holds a crackable hash"""
+    digest = hmac.new(app.secret_key.encode(), f'{username}\0{password}'.encode(), hashlib.sha256)
+    return f'auth/{digest.hexdigest()}'
 
 def init_db():
-    conn = sqlite3.connect(DATABASE)
+    conn = sqlite3.connect(DATABASE, timeout=30, isolation_level=None)
     c = conn.cursor()
+    c.execute('PRAGMA journal_mode = WAL')
+    
+    # Every gunicorn worker runs this on import; the write lock makes the schema
+    # checks, migration and seeding below happen once, one worker after another
+    c.execute('BEGIN IMMEDIATE')
+    
+    # Leaderboard tables created before member deletes cascaded are rebuilt below
+    legacy_tables = [
+        table for table, sql in c.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name IN (?, ?)",
+            ('weekly_leaderboard', 'monthly_leaderboard'))
+        if 'ON DELETE CASCADE' not in sql
+    ]
+    for table in legacy_tables:
+        c.execute(f'ALTER TABLE {table} RENAME TO {table}_old')
     
     # Create admin users table
     c.execute('''
@@ -82,7 +258,7 @@ def init_db():
             assessments_submitted INTEGER DEFAULT 0,
             bonus_points INTEGER DEFAULT 0,
             week_start DATE,
-            FOREIGN KEY (member_id) REFERENCES members(id),
+            FOREIGN KEY (member_id) REFERENCES members(id) ON DELETE CASCADE,
             UNIQUE(member_id, week_start)
         )
     ''')
@@ -96,11 +272,25 @@ def init_db():
             assessments_submitted INTEGER DEFAULT 0,
             bonus_points INTEGER DEFAULT 0,
             month_year TEXT,
-            FOREIGN KEY (member_id) REFERENCES members(id),
+            FOREIGN KEY (member_id) REFERENCES members(id) ON DELETE CASCADE,
             UNIQUE(member_id, month_year)
         )
     ''')
     
+    for table in legacy_tables:
+        c.execute(f'INSERT INTO {table} SELECT * FROM {table}_old')
+        c.execute(f'DROP TABLE {table}_old')
+    
+    # Covering indexes so the leaderboard joins never touch the table rows
+    c.execute('''
+        CREATE INDEX IF NOT EXISTS ix_weekly_wk_mem ON weekly_leaderboard
+        (week_start, member_id, sessions_attended, assessments_submitted, bonus_points)
+    ''')
+    c.execute('''
+        CREATE INDEX IF NOT EXISTS ix_monthly_my_mem ON monthly_leaderboard
+        (month_year, member_id, sessions_attended, assessments_submitted, bonus_points)
+    ''')
+    
     # Create audit log table
     c.execute('''
         CREATE TABLE IF NOT EXISTS audit_log (
@@ -112,32 +302,118 @@ def init_db():
         )
     ''')
     
+    # One row per board, bumped on every write; it lives in the database so all workers share it.
+    # The nonce is new for every database, so a recreated one never repeats an old ETag
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS leaderboard_version (
+            board TEXT PRIMARY KEY,
+            nonce TEXT NOT NULL,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    c.executemany('INSERT OR IGNORE INTO leaderboard_version (board, nonce) VALUES (?, ?)',
+                  [('weekly', secrets.token_hex(4)), ('monthly', secrets.token_hex(4))])
+    
     # Check if default admin exists
     existing_admin = c.execute('SELECT * FROM admin_users WHERE username = ?', ('admin',)).fetchone()
     if not existing_admin:
         default_password = hash_password('synapse2024')
-        c.execute('INSERT INTO admin_users (username, password_hash) VALUES (?, ?)', 
+        c.execute('INSERT OR IGNORE INTO admin_users (username, password_hash) VALUES (?, ?)', 
                   ('admin', default_password))
-        print("⚠️  DEFAULT ADMIN CREATED - Username: admin, Password: synapse2024")
-        print("⚠️  PLEASE CHANGE THIS PASSWORD IMMEDIATELY!")
+        if c.rowcount:
+            print("⚠️  DEFAULT ADMIN CREATED - Username: admin, Password: synapse2024")
+            print("⚠️  PLEASE CHANGE THIS PASSWORD IMMEDIATELY!")
     
-    conn.commit()
+    c.execute('COMMIT')
+    c.execute('ANALYZE')
     conn.close()
+    
+    # Everything below is per process
+    
+    # Prime the connection pool
+    for _ in range(POOL_SIZE - POOL.qsize()):
+        POOL.put(connect_db())
+    
+    start_log_writer()
 
-def get_db():
-    conn = sqlite3.connect(DATABASE)
+def connect_db():
+    """Open a pooled connection (autocommit, usable from any thread)"""
+    conn = sqlite3.connect(DATABASE, check_same_thread=False, isolation_level=None)
     conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = NORMAL')
+    conn.execute('PRAGMA foreign_keys = ON')
+    conn.execute('PRAGMA cache_size = -20000')
+    conn.execute('PRAGMA wal_autocheckpoint = 1000')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    conn.execute('PRAGMA mmap_size = 268435456')
     return conn
 
-def log_action(action, details):
-    """Log admin actions"""
-    username = session.get('username', 'system')
-    conn = get_db()
-    c = conn.cursor()
-    c.execute('INSERT INTO audit_log (admin_username, action, details) VALUES (?, ?, ?)',
-              (username, action, details))
-    conn.commit()
-    conn.close()
+@contextmanager
+def get_db():
+    """Borrow a connection from the pool for the duration of a block"""
+    global last_optimize
+    try:
+        conn = POOL.get_nowait()
+    except queue.Empty:
+        conn = connect_db()
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        # Refresh planner statistics now and then, as SQLite recommends for long-lived connections.
+        # It may need the write lock, so a failure is skipped rather than replacing the request's result
+        if time.monotonic() - last_optimize > OPTIMIZE_INTERVAL:
+            last_optimize = time.monotonic()
+            with suppress(sqlite3.Error):
+                conn.execute('PRAGMA optimize')
+        try:
+            POOL.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+AUDIT_INSERT = 'INSERT INTO audit_log (admin_username, action, details) VALUES (?, ?, ?)'
+
+def log_action(action, details, conn=None):
+    """Log admin actions, inside the caller's transaction when a connection is given"""
+    row = (session.get('username', 'system'), action, details)
+    if conn is not None:
+        conn.execute(AUDIT_INSERT, row)
+    elif log_writer is not None:
+        LOG_QUEUE.put(row)
+    else:
+        with get_db() as conn:
+            conn.execute(AUDIT_INSERT, row)
+
+def write_audit_log():
+    """Drain LOG_QUEUE into audit_log, committing once per batch"""
+    conn = connect_db()
+    while True:
+        batch = [LOG_QUEUE.get()]
+        with suppress(queue.Empty):
+            while len(batch) < LOG_BATCH_SIZE:
+                batch.append(LOG_QUEUE.get_nowait())
+        try:
+            conn.execute('BEGIN')
+            conn.executemany(AUDIT_INSERT, batch)
+            conn.execute('COMMIT')
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.rollback()
+            print(f"⚠️  Dropped {len(batch)} audit log rows: {e}")
+        finally:
+            for _ in batch:
+                LOG_QUEUE.task_done()
+
+def start_log_writer():
+    """Start the audit log writer thread once per process"""
+    global log_writer
+    if log_writer is None:
+        log_writer = threading.Thread(target=write_audit_log, name='audit-log-writer', daemon=True)
+        log_writer.start()
+        # Flush anything still queued before the interpreter exits
+        atexit.register(LOG_QUEUE.join)
 
 def require_auth(f):
     """Decorator to require authentication"""
@@ -154,20 +430,80 @@ def require_auth(f):
 
 # ========== HELPER FUNCTIONS ==========
 
-def calculate_points(sessions, assessments, bonus):
-    return (sessions * 10) + (assessments * 20) + bonus
-
 def get_week_start():
+    # Computed once per request so the cache key and the query always agree
+    if has_app_context() and 'week_start' in g:
+        return g.week_start
     today = date.today()
-    week_start = today - timedelta(days=today.weekday())
-    return week_start.isoformat()
+    week_start = (today - timedelta(days=today.weekday())).isoformat()
+    if has_app_context():
+        g.week_start = week_start
+    return week_start
 
 def get_month_year():
-    return datetime.now().strftime('%Y-%m')
+    if has_app_context() and 'month_year' in g:
+        return g.month_year
+    month_year = datetime.now().strftime('%Y-%m')
+    if has_app_context():
+        g.month_year = month_year
+    return month_year
+
+def fetch_leaderboard(conn, query, period):
+    """Run a leaderboard query, building each row's dict straight from a plain tuple"""
+    cur = conn.cursor()
+    cur.row_factory = None
+    return [
+        {'id': r[0], 'name': r[1], 'avatar': r[2], 'sessionsAttended': r[3],
+         'assessmentsSubmitted': r[4], 'bonusPoints': r[5], 'totalPoints': r[6]}
+        for r in cur.execute(query, (period,))
+    ]
+
+def leaderboard_version(board):
+    # Read once per request so the ETag, the cache key and the cached body all describe the same version
+    versions = g.setdefault('leaderboard_versions', {})
+    if board not in versions:
+        with get_db() as conn:
+            versions[board] = conn.execute("SELECT nonce || '-' || version FROM leaderboard_version WHERE board = ?",
+                                           (board,)).fetchone()[0]
+    return versions[board]
+
+def weekly_cache_key():
+    return f'leaderboard/weekly/{get_week_start()}/{leaderboard_version("weekly")}'
+
+def monthly_cache_key():
+    return f'leaderboard/monthly/{get_month_year()}/{leaderboard_version("monthly")}'
+
+def invalidate_leaderboards(conn, *boards):
+    """Bump the version of the given leaderboards inside the caller's write transaction"""
+    # Cached bodies are keyed by version, so the old entries are never read again and just expire;
+    # a slow reader that started before the write stores its result under the dead key
+    conn.executemany('UPDATE leaderboard_version SET version = version + 1 WHERE board = ?',
+                     [(board,) for board in boards])
+
+def leaderboard_etag(board):
+    period = get_week_start() if board == 'weekly' else get_month_year()
+    return f'{leaderboard_version(board)}-{period}'
+
+def conditional_leaderboard(board):
+    """Decorator answering If-None-Match from the version stamp, before the cached or rendered body"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            etag = leaderboard_etag(board)
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                response = make_response(f(*args, **kwargs))
+            # Weak, so compression leaves it alone
+            response.set_etag(etag, weak=True)
+            return response
+        return decorated_function
+    return decorator
 
 # ========== AUTH ROUTES ==========
 
 @app.route('/api/auth/login', methods=['POST'])
+@limiter.limit('5/minute')
 def login():
     """Admin login"""
     data = request.json
@@ -177,12 +513,22 @@ def login():
     if not username or not password:
         return jsonify({'success': False, 'error': 'Username and password required'}), 400
     
-    password_hash = hash_password(password)
-    
-    conn = get_db()
-    user = conn.execute('SELECT * FROM admin_users WHERE username = ? AND password_hash = ?',
-                       (username, password_hash)).fetchone()
-    conn.close()
+    # Skip the Argon2 cost for credentials verified in the last minute
+    cache_key = auth_cache_key(username, password)
+    user = cache.get(cache_key)
+    
+    if user is None:
+        with get_db() as conn:
+            row = conn.execute('SELECT id, username, role, password_hash FROM admin_users WHERE username = ?',
+                               (username,)).fetchone()
+            if row is None:
+                verify_password(dummy_password_hash(), password)
+            elif verify_password(row['password_hash'], password):
+                if needs_rehash(row['password_hash']):
+                    conn.execute('UPDATE admin_users SET password_hash = ? WHERE id = ?',
+                                 (hash_password(password), row['id']))
+                user = {'id': row['id'], 'username': row['username'], 'role': row['role']}
+                cache.set(cache_key, user, timeout=AUTH_CACHE_TTL)
     
     if user:
         session['user_id'] = user['id']
@@ -226,40 +572,47 @@ def auth_status():
 
 # ========== PUBLIC ROUTES ==========
 
+WEEKLY_QUERY = '''
+    SELECT 
+        m.id,
+        m.name,
+        m.avatar,
+        COALESCE(w.sessions_attended, 0) as sessionsAttended,
+        COALESCE(w.assessments_submitted, 0) as assessmentsSubmitted,
+        COALESCE(w.bonus_points, 0) as bonusPoints,
+        (COALESCE(w.sessions_attended, 0) * 10 + 
+         COALESCE(w.assessments_submitted, 0) * 20 + 
+         COALESCE(w.bonus_points, 0)) as totalPoints
+    FROM members m
+    LEFT JOIN weekly_leaderboard w ON m.id = w.member_id AND w.week_start = ?
+    ORDER BY totalPoints DESC
+'''
+
+MONTHLY_QUERY = '''
+    SELECT 
+        m.id,
+        m.name,
+        m.avatar,
+        COALESCE(ml.sessions_attended, 0) as sessionsAttended,
+        COALESCE(ml.assessments_submitted, 0) as assessmentsSubmitted,
+        COALESCE(ml.bonus_points, 0) as bonusPoints,
+        (COALESCE(ml.sessions_attended, 0) * 10 + 
+         COALESCE(ml.assessments_submitted, 0) * 20 + 
+         COALESCE(ml.bonus_points, 0)) as totalPoints
+    FROM members m
+    LEFT JOIN monthly_leaderboard ml ON m.id = ml.member_id AND ml.month_year = ?
+    ORDER BY totalPoints DESC
+'''
+
 @app.route('/api/leaderboard/weekly', methods=['GET'])
+@conditional_leaderboard('weekly')
+@cache.cached(key_prefix=weekly_cache_key)
 def get_weekly_leaderboard():
     """Get weekly leaderboard"""
     week_start = get_week_start()
     
-    conn = get_db()
-    query = '''
-        SELECT 
-            m.id,
-            m.name,
-            m.avatar,
-            COALESCE(w.sessions_attended, 0) as sessionsAttended,
-            COALESCE(w.assessments_submitted, 0) as assessmentsSubmitted,
-            COALESCE(w.bonus_points, 0) as bonusPoints
-        FROM members m
-        LEFT JOIN weekly_leaderboard w ON m.id = w.member_id AND w.week_start = ?
-        ORDER BY 
-            (COALESCE(w.sessions_attended, 0) * 10 + 
-             COALESCE(w.assessments_submitted, 0) * 20 + 
-             COALESCE(w.bonus_points, 0)) DESC
-    '''
-    
-    rows = conn.execute(query, (week_start,)).fetchall()
-    conn.close()
-    
-    data = []
-    for row in rows:
-        member = dict(row)
-        member['totalPoints'] = calculate_points(
-            member['sessionsAttended'],
-            member['assessmentsSubmitted'],
-            member['bonusPoints']
-        )
-        data.append(member)
+    with get_db() as conn:
+        data = fetch_leaderboard(conn, WEEKLY_QUERY, week_start)
     
     return jsonify({
         'success': True,
@@ -269,39 +622,14 @@ def get_weekly_leaderboard():
     })
 
 @app.route('/api/leaderboard/monthly', methods=['GET'])
+@conditional_leaderboard('monthly')
+@cache.cached(key_prefix=monthly_cache_key)
 def get_monthly_leaderboard():
     """Get monthly leaderboard"""
     month_year = get_month_year()
     
-    conn = get_db()
-    query = '''
-        SELECT 
-            m.id,
-            m.name,
-            m.avatar,
-            COALESCE(ml.sessions_attended, 0) as sessionsAttended,
-            COALESCE(ml.assessments_submitted, 0) as assessmentsSubmitted,
-            COALESCE(ml.bonus_points, 0) as bonusPoints
-        FROM members m
-        LEFT JOIN monthly_leaderboard ml ON m.id = ml.member_id AND ml.month_year = ?
-        ORDER BY 
-            (COALESCE(ml.sessions_attended, 0) * 10 + 
-             COALESCE(ml.assessments_submitted, 0) * 20 + 
-             COALESCE(ml.bonus_points, 0)) DESC
-    '''
-    
-    rows = conn.execute(query, (month_year,)).fetchall()
-    conn.close()
-    
-    data = []
-    for row in rows:
-        member = dict(row)
-        member['totalPoints'] = calculate_points(
-            member['sessionsAttended'],
-            member['assessmentsSubmitted'],
-            member['bonusPoints']
-        )
-        data.append(member)
+    with get_db() as conn:
+        data = fetch_leaderboard(conn, MONTHLY_QUERY, month_year)
     
     return jsonify({
         'success': True,
@@ -313,9 +641,8 @@ def get_monthly_leaderboard():
 @app.route('/api/members', methods=['GET'])
 def get_members():
     """Get all members"""
-    conn = get_db()
-    members = conn.execute('SELECT id, name, avatar FROM members ORDER BY name').fetchall()
-    conn.close()
+    with get_db() as conn:
+        members = conn.execute('SELECT id, name, avatar FROM members ORDER BY name').fetchall()
     
     return jsonify({
         'success': True,
@@ -324,6 +651,26 @@ def get_members():
 
 # ========== ADMIN ROUTES ==========
 
+WEEKLY_UPSERT = '''
+    INSERT INTO weekly_leaderboard 
+    (member_id, sessions_attended, assessments_submitted, bonus_points, week_start)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(member_id, week_start) DO UPDATE SET
+        sessions_attended = excluded.sessions_attended,
+        assessments_submitted = excluded.assessments_submitted,
+        bonus_points = excluded.bonus_points
+'''
+
+MONTHLY_UPSERT = '''
+    INSERT INTO monthly_leaderboard 
+    (member_id, sessions_attended, assessments_submitted, bonus_points, month_year)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(member_id, month_year) DO UPDATE SET
+        sessions_attended = excluded.sessions_attended,
+        assessments_submitted = excluded.assessments_submitted,
+        bonus_points = excluded.bonus_points
+'''
+
 @app.route('/api/admin/members', methods=['POST'])
 @require_auth
 def add_member():
@@ -334,15 +681,16 @@ def add_member():
         return jsonify({'success': False, 'error': 'Name is required'}), 400
     
     name = data['name']
-    avatar = data.get('avatar', f"https://ui-avatars.com/api/?name={name.replace(' ', '+')}&background=ff642c&color=fff&size=200")
+    # The admin UI sends avatar: null when none was picked
+    avatar = data.get('avatar') or DEFAULT_AVATAR_URL.format(quote_plus(name))
     
     try:
-        conn = get_db()
-        c = conn.cursor()
-        c.execute('INSERT INTO members (name, avatar) VALUES (?, ?)', (name, avatar))
-        member_id = c.lastrowid
-        conn.commit()
-        conn.close()
+        with get_db() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            c = conn.execute('INSERT INTO members (name, avatar) VALUES (?, ?)', (name, avatar))
+            member_id = c.lastrowid
+            invalidate_leaderboards(conn, 'weekly', 'monthly')
+            conn.execute('COMMIT')
         
         log_action('ADD_MEMBER', f'Added member: {name} (ID: {member_id})')
         
@@ -369,31 +717,51 @@ def update_weekly_leaderboard():
     
     week_start = get_week_start()
     
-    conn = get_db()
-    c = conn.cursor()
-    
-    member = c.execute('SELECT name FROM members WHERE id = ?', (member_id,)).fetchone()
-    if not member:
-        conn.close()
-        return jsonify({'success': False, 'error': 'Member not found'}), 404
-    
-    c.execute('''
-        INSERT INTO weekly_leaderboard 
-        (member_id, sessions_attended, assessments_submitted, bonus_points, week_start)
-        VALUES (?, ?, ?, ?, ?)
-        ON CONFLICT(member_id, week_start) DO UPDATE SET
-            sessions_attended = excluded.sessions_attended,
-            assessments_submitted = excluded.assessments_submitted,
-            bonus_points = excluded.bonus_points
-    ''', (member_id, sessions, assessments, bonus, week_start))
-    
-    conn.commit()
-    conn.close()
+    with get_db() as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        member = conn.execute('SELECT name FROM members WHERE id = ?', (member_id,)).fetchone()
+        if not member:
+            return jsonify({'success': False, 'error': 'Member not found'}), 404
+        
+        conn.execute(WEEKLY_UPSERT, (member_id, sessions, assessments, bonus, week_start))
+        invalidate_leaderboards(conn, 'weekly')
+        conn.execute('COMMIT')
     
     log_action('UPDATE_WEEKLY', f'Updated weekly stats for {member["name"]}')
     
     return jsonify({'success': True, 'message': 'Weekly leaderboard updated'})
 
+@app.route('/api/admin/leaderboard/weekly/bulk_update', methods=['POST'])
+@require_auth
+def bulk_update_weekly_leaderboard():
+    """Update weekly leaderboard for several members in one transaction"""
+    entries = request.json.get('entries')
+    
+    if not entries or not isinstance(entries, list):
+        return jsonify({'success': False, 'error': 'entries must be a non-empty list'}), 400
+    if not all(isinstance(e, dict) and e.get('member_id') for e in entries):
+        return jsonify({'success': False, 'error': 'member_id is required for every entry'}), 400
+    
+    week_start = get_week_start()
+    rows = [
+        (e['member_id'], e.get('sessions_attended', 0), e.get('assessments_submitted', 0),
+         e.get('bonus_points', 0), week_start)
+        for e in entries
+    ]
+    
+    try:
+        with get_db() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany(WEEKLY_UPSERT, rows)
+            log_action('BULK_UPDATE_WEEKLY', f'Updated weekly stats for {len(rows)} members', conn)
+            invalidate_leaderboards(conn, 'weekly')
+            conn.execute('COMMIT')
+    except sqlite3.IntegrityError:
+        # foreign_keys rejects any entry whose member does not exist
+        return jsonify({'success': False, 'error': 'Member not found'}), 404
+    
+    return jsonify({'success': True, 'message': f'Weekly leaderboard updated for {len(rows)} members'})
+
 @app.route('/api/admin/leaderboard/monthly/update', methods=['POST'])
 @require_auth
 def update_monthly_leaderboard():
@@ -410,31 +778,51 @@ def update_monthly_leaderboard():
     
     month_year = get_month_year()
     
-    conn = get_db()
-    c = conn.cursor()
-    
-    member = c.execute('SELECT name FROM members WHERE id = ?', (member_id,)).fetchone()
-    if not member:
-        conn.close()
-        return jsonify({'success': False, 'error': 'Member not found'}), 404
+    with get_db() as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        member = conn.execute('SELECT name FROM members WHERE id = ?', (member_id,)).fetchone()
+        if not member:
+            return jsonify({'success': False, 'error': 'Member not found'}), 404
+        
+        conn.execute(MONTHLY_UPSERT, (member_id, sessions, assessments, bonus, month_year))
+        invalidate_leaderboards(conn, 'monthly')
+        conn.execute('COMMIT')
     
-    c.execute('''
-        INSERT INTO monthly_leaderboard 
-        (member_id, sessions_attended, assessments_submitted, bonus_points, month_year)
-        VALUES (?, ?, ?, ?, ?)
-        ON CONFLICT(member_id, month_year) DO UPDATE SET
-            sessions_attended = excluded.sessions_attended,
-            assessments_submitted = excluded.assessments_submitted,
-            bonus_points = excluded.bonus_points
-    ''', (member_id, sessions, assessments, bonus, month_year))
-    
-    conn.commit()
-    conn.close()
-     
     log_action('UPDATE_MONTHLY', f'Updated monthly stats for {member["name"]}')
     
     return jsonify({'success': True, 'message': 'Monthly leaderboard updated'})
 
+@app.route('/api/admin/leaderboard/monthly/bulk_update', methods=['POST'])
+@require_auth
+def bulk_update_monthly_leaderboard():
+    """Update monthly leaderboard for several members in one transaction"""
+    entries = request.json.get('entries')
+    
+    if not entries or not isinstance(entries, list):
+        return jsonify({'success': False, 'error': 'entries must be a non-empty list'}), 400
+    if not all(isinstance(e, dict) and e.get('member_id') for e in entries):
+        return jsonify({'success': False, 'error': 'member_id is required for every entry'}), 400
+    
+    month_year = get_month_year()
+    rows = [
+        (e['member_id'], e.get('sessions_attended', 0), e.get('assessments_submitted', 0),
+         e.get('bonus_points', 0), month_year)
+        for e in entries
+    ]
+    
+    try:
+        with get_db() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany(MONTHLY_UPSERT, rows)
+            log_action('BULK_UPDATE_MONTHLY', f'Updated monthly stats for {len(rows)} members', conn)
+            invalidate_leaderboards(conn, 'monthly')
+            conn.execute('COMMIT')
+    except sqlite3.IntegrityError:
+        # foreign_keys rejects any entry whose member does not exist
+        return jsonify({'success': False, 'error': 'Member not found'}), 404
+    
+    return jsonify({'success': True, 'message': f'Monthly leaderboard updated for {len(rows)} members'})
+
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check"""
@@ -448,22 +836,17 @@ def health():
 @require_auth
 def delete_member(member_id):
     """Delete a member from the system"""
-    conn = get_db()
-    c = conn.cursor()
-    
-    member = c.execute('SELECT name FROM members WHERE id = ?', (member_id,)).fetchone()
-    if not member:
-        conn.close()
-        return jsonify({'success': False, 'error': 'Member not found'}), 404
-    
-    c.execute('DELETE FROM weekly_leaderboard WHERE member_id = ?', (member_id,))
-    c.execute('DELETE FROM monthly_leaderboard WHERE member_id = ?', (member_id,))
-    c.execute('DELETE FROM members WHERE id = ?', (member_id,))
-    
-    conn.commit()
-    conn.close()
-    
-    log_action('DELETE_MEMBER', f'Deleted member: {member["name"]} (ID: {member_id})')
+    with get_db() as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        member = conn.execute('SELECT name FROM members WHERE id = ?', (member_id,)).fetchone()
+        if not member:
+            return jsonify({'success': False, 'error': 'Member not found'}), 404
+        
+        # Leaderboard rows go with it through ON DELETE CASCADE
+        conn.execute('DELETE FROM members WHERE id = ?', (member_id,))
+        log_action('DELETE_MEMBER', f'Deleted member: {member["name"]} (ID: {member_id})', conn)
+        invalidate_leaderboards(conn, 'weekly', 'monthly')
+        conn.execute('COMMIT')
     
     return jsonify({'success': True, 'message': f'Member {member["name"]} deleted'})
 
@@ -471,17 +854,13 @@ def delete_member(member_id):
 @require_auth
 def delete_weekly_entry(member_id):
     week_start = get_week_start()
-    conn = get_db()
-    c = conn.cursor()
-    
-    c.execute('SELECT * FROM weekly_leaderboard WHERE member_id = ? AND week_start = ?', (member_id, week_start))
-    if not c.fetchone():
-        conn.close()
-        return jsonify({'success': False, 'error': 'Entry not found'}), 404
-    
-    c.execute('DELETE FROM weekly_leaderboard WHERE member_id = ? AND week_start = ?', (member_id, week_start))
-    conn.commit()
-    conn.close()
+    with get_db() as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        c = conn.execute('DELETE FROM weekly_leaderboard WHERE member_id = ? AND week_start = ?', (member_id, week_start))
+        if c.rowcount == 0:
+            return jsonify({'success': False, 'error': 'Entry not found'}), 404
+        invalidate_leaderboards(conn, 'weekly')
+        conn.execute('COMMIT')
     
     log_action('DELETE_WEEKLY', f'Deleted weekly stats for member ID {member_id}')
     return jsonify({'success': True, 'message': 'Weekly leaderboard entry deleted'})
@@ -490,23 +869,21 @@ def delete_weekly_entry(member_id):
 @require_auth
 def delete_monthly_entry(member_id):
     month_year = get_month_year()
-    conn = get_db()
-    c = conn.cursor()
-    
-    c.execute('SELECT * FROM monthly_leaderboard WHERE member_id = ? AND month_year = ?', (member_id, month_year))
-    if not c.fetchone():
-        conn.close()
-        return jsonify({'success': False, 'error': 'Entry not found'}), 404
-    
-    c.execute('DELETE FROM monthly_leaderboard WHERE member_id = ? AND month_year = ?', (member_id, month_year))
-    conn.commit()
-    conn.close()
+    with get_db() as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        c = conn.execute('DELETE FROM monthly_leaderboard WHERE member_id = ? AND month_year = ?', (member_id, month_year))
+        if c.rowcount == 0:
+            return jsonify({'success': False, 'error': 'Entry not found'}), 404
+        invalidate_leaderboards(conn, 'monthly')
+        conn.execute('COMMIT')
     
     log_action('DELETE_MONTHLY', f'Deleted monthly stats for member ID {member_id}')
     return jsonify({'success': True, 'message': 'Monthly leaderboard entry deleted'})
 
+# Runs on import as well, so gunicorn workers get their tables, pool and log writer
+init_db()
+
 if __name__ == '__main__':
-    init_db()
     print("=" * 60)
     print("SYNAPSE Leaderboard API")
     print("=" * 60)
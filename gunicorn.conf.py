@@ -0,0 +1,17 @@
+# Gunicorn settings, loaded automatically from the project directory
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+
+# Threads rather than gevent: sqlite3 and Argon2 block in C and would stall an event loop,
+# while real threads overlap them and share the connection pool.
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', multiprocessing.cpu_count() * 2 + 1))
+
+# One process keeps the in-memory response cache, rate limits and audit queue consistent.
+# Raise WEB_CONCURRENCY only with CACHE_TYPE=RedisCache and a Redis RATELIMIT_STORAGE_URI.
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+# Hand static files to the kernel via wsgi.file_wrapper
+sendfile = True